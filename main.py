@@ -1,6 +1,7 @@
 from fastapi import FastAPI, Query
 from fastapi.responses import JSONResponse
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 import json
 import os
@@ -35,11 +36,17 @@ KST = ZoneInfo("Asia/Seoul")
 # Jieqi helpers
 # =========================
 
+@lru_cache(maxsize=1)
+def _load_jieqi_table_cached(mtime_ns: int):
+    # 파일이 바뀔 때(mtime)만 다시 파싱 — 요청마다 ~0.5MB JSON 재로드 방지
+    # ⚠️ 반환 dict/list는 모든 요청이 공유 (calc_saju 응답에도 그대로 나감) → 수정 금지, 필요하면 복사해서
+    with JIEQI_TABLE_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
 def load_jieqi_table():
     if not JIEQI_TABLE_PATH.exists():
         raise FileNotFoundError(f"[JIEQI] missing file: {JIEQI_TABLE_PATH}")
-    with JIEQI_TABLE_PATH.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load_jieqi_table_cached(JIEQI_TABLE_PATH.stat().st_mtime_ns)
 
 def _parse_dt_any(value):
     if value is None:
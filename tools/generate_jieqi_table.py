@@ -1,13 +1,24 @@
 # tools/generate_jieqi_table.py
 # JIEQI_GENERATOR_VERSION=skyfield_root_finding_final_B_1901_hardclamp_de421
 
+import hashlib
 import json
 import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 
 import numpy as np
+from jplephem.daf import DAF
+from jplephem.excerpter import write_excerpt
+from jplephem.spk import SPK
 from skyfield.api import load
 
+try:
+    import orjson  # C 구현 직렬화 (없으면 표준 json)
+except ImportError:
+    orjson = None
+
 # -----------------------------
 # Config
 # -----------------------------
@@ -19,13 +30,50 @@ END_YEAR = int(os.getenv("JIEQI_END_YEAR", "2052"))
 OUTPUT_PATH = os.getenv("JIEQI_OUTPUT", os.path.join("data", "jieqi_1900_2052.json"))
 APPEND = os.getenv("JIEQI_APPEND", "true").lower() in ("1", "true", "yes", "y")
 
+# 압축 JSON (~1.4배 작음: 548KB → 394KB). 기본은 커밋 diff용 indent=2, 중간 저장은 항상 압축
+COMPACT = os.getenv("JIEQI_COMPACT", "false").lower() in ("1", "true", "yes", "y")
+
+EPHEMERIS_PATH = "de421.bsp"
+
+# de421에서 태양 황경 계산에 필요한 세그먼트만 잘라낸 커널 (달/행성 제외 → 작업 세트 축소)
+# 지구: 0→3→399, 태양: 0→10, apparent() 광선 굴절용 목성/토성 질량중심: 0→5, 0→6
+SUN_KERNEL_PATH = os.getenv("JIEQI_SUN_KERNEL", os.path.join("data", "de421_sun.bsp"))
+SUN_KERNEL_TARGETS = (3, 399, 10, 5, 6)
+
+# 기존 표를 만든 생성기 소스 해시 → 같은 소스 + 더 오래된 천체력이면 있는 연도는 재계산 생략
+STAMP_PATH = OUTPUT_PATH + ".stamp"
+
+# 연도별 계산은 서로 독립 → 프로세스 병렬
+WORKERS = int(os.getenv("JIEQI_WORKERS", str(os.cpu_count() or 1)))
+# 병렬일 때 작업 1건당 연도 수 (작업 단위로 스캔 1회, 결과는 작업 단위로 전달/저장)
+CHUNK_YEARS = int(os.getenv("JIEQI_CHUNK_YEARS", "10"))
+
 KST = timezone(timedelta(hours=9))
 
-# ✅ de421 커버리지 (Skyfield 에러 메시지에 찍히는 범위 그대로 하드코딩)
+# ✅ de421 커버리지 (Skyfield 에러 메시지에 찍히는 범위 그대로 하드코딩, TT JD)
 # "ephemeris segment only covers dates 1899-07-29 through 2053-10-09"
-DE421_START_UTC = (1899, 7, 29, 0, 0, 0)
-DE421_END_UTC = (2053, 10, 9, 0, 0, 0)
-COVERAGE_SAFETY_DAYS = 2.0  # TT/TDB 경계 떨림 회피용
+DE421_START_TT = 2414864.5  # 1899-07-29 00:00
+DE421_END_TT = 2471184.5  # 2053-10-09 00:00
+COVERAGE_SAFETY_DAYS = 2.0  # TT/TDB/UTC 경계 떨림 회피용
+
+# 안전마진 포함 탐색 한계 (import 시 확정 → 실행 중 Time 생성 없음)
+COVERAGE_TT = (DE421_START_TT + COVERAGE_SAFETY_DAYS, DE421_END_TT - COVERAGE_SAFETY_DAYS)
+
+# 태양 황경 조대 탐색 간격 (시간)
+# 황경은 하루 최대 ~1.02° 단조 증가, 절기 간격은 15° → 5일 간격이어도 한 칸에 ≤5.1°.
+# 인접 샘플 사이에 목표 황경이 둘 이상 들어갈 수 없으므로 브래킷이 유일하다.
+SCAN_STEP_HOURS = float(os.getenv("JIEQI_SCAN_STEP_HOURS", "120"))
+
+# 조대 탐색은 기하학적 태양 벡터 (광행시/광행차/굴절 생략 → ~3배 빠름) + 광행차 상수 보정
+# 겉보기 황경과의 잔차는 ±0.4″ 이내 (1901~2052 실측) → 근 보정은 겉보기 황경으로
+ABERRATION_DEG = -20.49552 / 3600.0
+# 근사 황경 오차만큼 브래킷 여유 (0.01일 ≈ 황경 36″, 잔차보다 충분히 큼)
+BRACKET_PAD_DAYS = 0.01
+
+# 근 보정: 3차 보간 시드 → Skyfield 평가 + Newton (실패 시 브래킷 할선법)
+NEWTON_MAX_ITERS = 6
+ROOT_TOL_DAYS = 1e-11  # ~1µs (2파트 JD 기준, 황경 계산 잡음 ~10ns보다 충분히 큼)
+BRACKET_MAX_ITERS = 30  # Newton 실패 시 폴백 (Illinois: 초선형, 보통 5~8회)
 
 JIEQI_24 = [
     ("소한", 285), ("대한", 300), ("입춘", 315), ("우수", 330),
@@ -36,6 +84,11 @@ JIEQI_24 = [
     ("입동", 225), ("소설", 240), ("대설", 255), ("동지", 270),
 ]
 
+# 황경(deg // 15) → JIEQI_24 인덱스
+_TERM_BY_DEG = np.empty(24, dtype=int)
+for _i, (_, _deg) in enumerate(JIEQI_24):
+    _TERM_BY_DEG[_deg // 15] = _i
+
 
 # -----------------------------
 # Helpers
@@ -49,151 +102,303 @@ def _ensure_parent_dir(path: str):
 def _load_existing(path: str) -> dict:
     if APPEND and os.path.exists(path):
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(path, "rb") as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
             return data if isinstance(data, dict) else {}
         except Exception:
             return {}
     return {}
 
 
-def _save_json_atomic(path: str, data: dict):
+def _ensure_sun_kernel() -> str:
+    # 없거나 de421.bsp보다 오래됐으면 생성 (전 구간 그대로, 세그먼트만 선별)
+    if os.path.exists(SUN_KERNEL_PATH) and os.path.getmtime(SUN_KERNEL_PATH) >= os.path.getmtime(EPHEMERIS_PATH):
+        return SUN_KERNEL_PATH
+
+    _ensure_parent_dir(SUN_KERNEL_PATH)
+    tmp = SUN_KERNEL_PATH + ".tmp"
+    with open(EPHEMERIS_PATH, "rb") as f:
+        spk = SPK(DAF(f))
+        summaries = [
+            summary for summary, segment in zip(spk.daf.summaries(), spk.segments)
+            if segment.target in SUN_KERNEL_TARGETS
+        ]
+        with open(tmp, "w+b") as out:
+            write_excerpt(spk, out, DE421_START_TT, DE421_END_TT, summaries)
+    os.replace(tmp, SUN_KERNEL_PATH)
+    return SUN_KERNEL_PATH
+
+
+def _source_hash() -> str:
+    with open(os.path.abspath(__file__), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _cache_valid(path: str) -> bool:
+    # 기존 표가 de421.bsp보다 새롭고, 현재 소스로 생성된 것인지
+    if not (APPEND and os.path.exists(path) and os.path.exists(STAMP_PATH)):
+        return False
+    if os.path.getmtime(EPHEMERIS_PATH) >= os.path.getmtime(path):
+        return False
+    try:
+        with open(STAMP_PATH, "r", encoding="utf-8") as f:
+            return f.read().strip() == _source_hash()
+    except OSError:
+        return False
+
+
+def _save_stamp():
+    tmp = STAMP_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(_source_hash())
+    os.replace(tmp, STAMP_PATH)
+
+
+def _save_json_atomic(path: str, data: dict, compact: bool = False):
     _ensure_parent_dir(path)
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(data) if compact else orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            if compact:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            else:
+                json.dump(data, f, ensure_ascii=False, indent=2)
     os.replace(tmp, path)
 
 
-def _sun_ecl_lon_deg(eph, ts, dt_utc: datetime) -> float:
-    earth = eph["earth"]
-    sun = eph["sun"]
-    t = ts.from_datetime(dt_utc)
-    lon = earth.at(t).observe(sun).apparent().ecliptic_latlon()[1].degrees
+def _sun_lons_deg(earth, sun, times):
+    # 겉보기 태양 황경 (0~360) — 스칼라/배열 Time 모두 처리
+    lon = earth.at(times).observe(sun).apparent().ecliptic_latlon()[1].degrees
     return lon % 360.0
 
 
-def _to_utc_aware(dt: datetime) -> datetime:
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=timezone.utc)
-    return dt.astimezone(timezone.utc)
-
-
-# -----------------------------
-# Core
-# -----------------------------
-def generate_year(eph, ts, year: int):
-    UTC = timezone.utc
+def _sun_lons_approx_deg(earth_to_sun, times):
+    # 기하학적 태양 황경 + 광행차 보정 (0~360) — 조대 탐색 전용
+    lon = earth_to_sun.at(times).ecliptic_latlon()[1].degrees
+    return (lon + ABERRATION_DEG) % 360.0
 
-    # 넉넉한 탐색 구간 (연초 절기 누락 방지)
-    dt0 = datetime(year - 2, 12, 1, 0, 0, tzinfo=UTC)
-    dt1 = datetime(year + 1, 1, 31, 0, 0, tzinfo=UTC)
 
-    # ✅ de421 커버리지 Time 생성
-    eph_start_t = ts.utc(*DE421_START_UTC)
-    eph_end_t = ts.utc(*DE421_END_UTC)
+def _bracket_roots(f, days, targets, lo_tt, hi_tt, f_lo, f_hi):
+    # f(lo), f(hi) 부호가 다른 구간들에서 Illinois 할선법 (f_lo/f_hi는 브래킷 양 끝에서 이미 계산된 값)
+    # lo/hi/근은 days(정수 일) 기준 오프셋 → 2파트 JD로 정밀도 유지
+    # 같은 쪽 끝이 연속으로 남으면 그 쪽 f를 절반으로 → 이진 탐색보다 Skyfield 평가 횟수 훨씬 적음
+    # 모든 구간을 동시에 진행: 반복마다 미수렴 구간 전체를 f 배치 호출 1회로
+    lo_tt, hi_tt = lo_tt.copy(), hi_tt.copy()
+    f_lo, f_hi = f_lo.copy(), f_hi.copy()
+    x_tt = hi_tt.copy()
+    side = np.zeros(len(x_tt), dtype=int)
+    pending = np.arange(len(x_tt))
+    for _ in range(BRACKET_MAX_ITERS):
+        if len(pending) == 0:
+            break
+        p = pending
+        prev_tt = x_tt[p]
+        x_tt[p] = (lo_tt[p] * f_hi[p] - hi_tt[p] * f_lo[p]) / (f_hi[p] - f_lo[p])
+        f_x = f(days[p], x_tt[p], targets[p])
 
-    # ✅ TT 기준으로 클램프 + 안전마진
-    t0 = ts.from_datetime(dt0)
-    t1 = ts.from_datetime(dt1)
+        left = f_lo[p] * f_x < 0  # 근이 [lo, x] 쪽
+        l, r = p[left], p[~left]
+        f_lo[l[side[l] == -1]] /= 2.0
+        f_hi[r[side[r] == 1]] /= 2.0
+        hi_tt[l], f_hi[l], side[l] = x_tt[l], f_x[left], -1
+        lo_tt[r], f_lo[r], side[r] = x_tt[r], f_x[~left], 1
 
-    if t0.tt < eph_start_t.tt:
-        dt0 = _to_utc_aware((eph_start_t + COVERAGE_SAFETY_DAYS).utc_datetime())
-    if t1.tt > eph_end_t.tt:
-        dt1 = _to_utc_aware((eph_end_t - COVERAGE_SAFETY_DAYS).utc_datetime())
+        pending = p[(f_x != 0) & (np.abs(x_tt[p] - prev_tt) >= ROOT_TOL_DAYS)]
 
-    if dt0 >= dt1:
-        raise RuntimeError(f"{year} search range invalid after clamp: dt0={dt0} dt1={dt1}")
+    # 반복 한도 초과 → 미수렴 근을 그대로 쓰지 않고 중단
+    if len(pending):
+        raise RuntimeError(f"bracket solver did not converge: targets={(targets[pending] % 360.0).tolist()}")
+    return x_tt
 
-    # 6시간 샘플링
-    step = timedelta(hours=6)
-    dts = []
-    cur = dt0
-    while cur <= dt1:
-        dts.append(cur)
-        cur += step
 
-    earth = eph["earth"]
-    sun = eph["sun"]
+def _to_iso_utc(dt: datetime) -> str:
+    # dt는 이미 UTC (Skyfield utc_datetime) → 변환 없이 포맷만
+    return dt.isoformat().replace("+00:00", "Z")
 
-    times = ts.from_datetimes(dts)
-    lon = (earth.at(times).observe(sun).apparent().ecliptic_latlon()[1].degrees) % 360.0
 
-    # unwrap: 359->0 경계 제거
-    lon_unwrapped = np.rad2deg(np.unwrap(np.deg2rad(lon)))
-    min_lon = float(np.min(lon_unwrapped))
-    max_lon = float(np.max(lon_unwrapped))
+# -----------------------------
+# Core
+# -----------------------------
+def _scan_events(earth, sun, ts, tt0: float, tt1: float):
+    # [tt0, tt1] 구간의 모든 15° 통과 → (TT JD 정수 일, 일 오프셋, JIEQI_24 인덱스) 배열, 시간순
+    # ✅ de421 커버리지 클램프: 양 끝 구간만 해당 → 대부분 그대로 통과
+    cov0, cov1 = COVERAGE_TT
+    if tt0 < cov0 or tt1 > cov1:
+        tt0 = max(tt0, cov0)
+        tt1 = min(tt1, cov1)
+        if tt0 >= tt1:
+            raise RuntimeError(f"search range invalid after clamp: tt0={tt0} tt1={tt1}")
+
+    # 조대 샘플링: 전체 구간을 TT JD 격자 1개로 → Skyfield 배치 호출 1회
+    step_days = SCAN_STEP_HOURS / 24.0
+    tts = np.arange(tt0, tt1 + step_days * 0.5, step_days)
+
+    lon = _sun_lons_approx_deg(sun - earth, ts.tt_jd(tts))
+
+    # unwrap: 359->0 경계 제거 (도 단위 그대로, 라디안 왕복 변환 없이)
+    lon_unwrapped = np.unwrap(lon, period=360.0)
+
+    # 황경 단조 증가 → 구간 안의 모든 15° 배수 목표를 이진 탐색으로 한 번에 브래킷
+    # lon[i] < target <= lon[i + 1] 인 i (O(M log N), 전체 배열 임시 생성 없음)
+    k0 = np.floor(lon_unwrapped[0] / 15.0) + 1.0
+    k1 = np.floor(lon_unwrapped[-1] / 15.0)
+    targets = np.arange(k0, k1 + 1.0) * 15.0
+    brackets = np.searchsorted(lon_unwrapped, targets, side="left") - 1
+
+    # 브래킷 주변 4점으로 3차 다항식 보간 (황경은 매우 매끄러움)
+    # 전체 브래킷을 (M, 4, 4) Vandermonde 배치 선형계 1회로 → 브래킷별 Python 루프 없음
+    j0 = np.clip(brackets - 1, 0, len(tts) - 4)
+    cols = j0[:, None] + np.arange(4)
+    x = tts[cols] - tts[brackets][:, None]
+    y = lon_unwrapped[cols] - targets[:, None]
+    c0, c1, c2, c3 = np.linalg.solve(x[:, :, None] ** np.arange(4), y[:, :, None])[:, :, 0].T
+
+    # 선형 보간 시드 → 다항식 Newton 1회
+    y0 = lon_unwrapped[brackets] - targets
+    y1 = lon_unwrapped[brackets + 1] - targets
+    u = -y0 / (y1 - y0) * (tts[brackets + 1] - tts[brackets])
+    u -= (((c3 * u + c2) * u + c1) * u + c0) / ((3.0 * c3 * u + 2.0 * c2) * u + c1)
+    rates = (3.0 * c3 * u + 2.0 * c2) * u + c1  # deg/day
+
+    # ✅ 근 보정 상태는 근마다 정수 일(days) + 오프셋 (Skyfield 2파트 JD)
+    # JD ~2.4e6 단일 float64는 한 칸이 ~40µs → μs 출력이 스캔 격자/작업 분할에 따라 흔들림
+    # 오프셋은 몇 일 이내라 ~1e-15일 정밀도 → 수렴값이 시드와 무관하게 같은 μs로
+    days = np.floor(tts[brackets])
+    base = tts[brackets] - days  # 정수 차 → 정확
+    roots = base + u
+
+    def f(day, tt, target):
+        # 목표 황경과의 차 (-180~180), 스칼라/배열 모두
+        l0 = _sun_lons_deg(earth, sun, ts.tt_jd(day, tt))
+        return (l0 - target + 180.0) % 360.0 - 180.0
+
+    # Skyfield로 확인 + Newton 보정: 반복마다 미수렴 근 전체를 배치 호출 1회 (보통 1~2회)
+    lo_tts = base - BRACKET_PAD_DAYS
+    hi_tts = base + (tts[brackets + 1] - tts[brackets]) + BRACKET_PAD_DAYS
+    pending = np.arange(len(roots))
+    failed = []
+    for _ in range(NEWTON_MAX_ITERS):
+        if len(pending) == 0:
+            break
+        du = f(days[pending], roots[pending], targets[pending]) / rates[pending]
+        roots[pending] -= du
+
+        r = roots[pending]
+        outside = (r < lo_tts[pending]) | (r > hi_tts[pending])
+        failed.extend(pending[outside].tolist())
+        pending = pending[~outside & (np.abs(du) >= ROOT_TOL_DAYS)]
+    failed.extend(pending.tolist())
+
+    # Newton 발산/브래킷 이탈 → 브래킷 할선법으로 폴백 (실패한 근 전체를 한 번에)
+    # 스캔 값은 근사 황경 → 브래킷 양 끝은 겉보기 황경으로 다시 평가 (배치 1회)
+    if failed:
+        failed = np.array(failed)
+        lo, hi = lo_tts[failed], hi_tts[failed]
+        f_lo, f_hi = np.split(f(np.tile(days[failed], 2), np.concatenate([lo, hi]), np.tile(targets[failed], 2)), 2)
+        # 근사 황경 잔차가 여유를 넘으면 부호 변화 보장 없음 → 틀린 근 대신 중단
+        bad = f_lo * f_hi > 0
+        if np.any(bad):
+            raise RuntimeError(f"no sign change in bracket: targets={(targets[failed[bad]] % 360.0).tolist()}")
+        roots[failed] = _bracket_roots(f, days[failed], targets[failed], lo, hi, f_lo, f_hi)
+
+    degs = (targets % 360.0).astype(int)
+    return days, roots, _TERM_BY_DEG[degs // 15]
+
+
+def _format_events(ts, days, fracs, terms):
+    # 배열 Time 1개로 UTC 달력 변환 일괄 처리 (절기마다 Time 생성 X), 2파트 JD 그대로
+    utc_dts = ts.tt_jd(days, fracs).utc_datetime()
 
     results = []
+    for utc_dt, i in zip(utc_dts, terms.tolist()):
+        name, deg = JIEQI_24[i]
 
-    for name, deg in JIEQI_24:
-        deg = float(deg)
+        # ✅ 초 단위 올림: 근 잡음(~10ns)이 μs 자리를 흔들어 작업 분할/워커 수마다 표가 달라지던 문제 제거
+        # 올림이라 분/초 단위 출생 시각과의 비교(birth_dt >= 절기) 결과는 μs 값과 동일
+        if utc_dt.microsecond:
+            utc_dt = utc_dt.replace(microsecond=0) + timedelta(seconds=1)
 
-        k_min = int(np.floor((min_lon - deg) / 360.0)) - 1
-        k_max = int(np.ceil((max_lon - deg) / 360.0)) + 1
+        kst_dt = utc_dt.astimezone(KST)
+        results.append(
+            {
+                "name": name,
+                "degree": int(deg),
+                "utc": _to_iso_utc(utc_dt),
+                "kst": kst_dt.isoformat(),
+            }
+        )
+    return results
 
-        best = None  # (kst_dt, utc_dt)
 
-        for k in range(k_min, k_max + 1):
-            target = deg + 360.0 * k
-            diff = lon_unwrapped - target
+def generate_years(earth, sun, ts, years):
+    # 연속된 연도 구간을 한 번에 스캔한 뒤 KST 연도 경계로 분할
+    first, last = years[0], years[-1]
 
-            idx = None
-            for i in range(len(diff) - 1):
-                if diff[i] * diff[i + 1] < 0:
-                    idx = i
-                    break
-            if idx is None:
-                continue
+    # KST 1월 1일 00:00 = UTC 전날 15:00
+    bounds = ts.utc(np.arange(first, last + 2), 1, 1, -9).tt
 
-            left_dt = dts[idx]
-            right_dt = dts[idx + 1]
+    # 스캔은 연도 경계 바깥으로 격자 2칸만 (경계 근처 절기도 브래킷 + 3차 보간 4점 확보)
+    # 경계 밖 절기는 버려지므로 그만큼 Skyfield 평가/Newton 대상 축소
+    pad_days = 2.0 * SCAN_STEP_HOURS / 24.0
+    days, fracs, terms = _scan_events(earth, sun, ts, bounds[0] - pad_days, bounds[-1] + pad_days)
+    cuts = np.searchsorted(days + fracs, bounds)
 
-            def f(dt: datetime) -> float:
-                l0 = _sun_ecl_lon_deg(eph, ts, dt)
-                l_cont = l0 + 360.0 * round((target - l0) / 360.0)
-                return l_cont - target
+    out = {}
+    for n, year in enumerate(years):
+        y_terms = terms[cuts[n]:cuts[n + 1]]
+        if len(y_terms) != len(JIEQI_24) or len(set(y_terms.tolist())) != len(JIEQI_24):
+            # 진단용 1패스 집계 (누락 + 중복)
+            counts = Counter(y_terms.tolist())
+            missing = [name for i, (name, _) in enumerate(JIEQI_24) if i not in counts]
+            dups = [JIEQI_24[i][0] for i, c in sorted(counts.items()) if c > 1]
+            raise RuntimeError(f"{year} has {len(y_terms)} terms (missing: {missing}, dups: {dups})")
+        sl = slice(cuts[n], cuts[n + 1])
+        out[year] = _format_events(ts, days[sl], fracs[sl], y_terms)
+    return out
 
-            fl = f(left_dt)
-            fr = f(right_dt)
-            if fl * fr > 0:
-                continue
 
-            # 이진 탐색
-            for _ in range(60):
-                mid_dt = left_dt + (right_dt - left_dt) / 2
-                fm = f(mid_dt)
-                if fl * fm <= 0:
-                    right_dt = mid_dt
-                    fr = fm
-                else:
-                    left_dt = mid_dt
-                    fl = fm
+# -----------------------------
+# Worker
+# -----------------------------
+_EARTH = None
+_SUN = None
+_TS = None
 
-            utc_dt = right_dt
-            kst_dt = utc_dt.astimezone(KST)
 
-            if kst_dt.year != year:
-                continue
+def _init_worker(kernel_path: str):
+    # 워커 프로세스당 1회 로드 (커널은 mmap이라 페이지 캐시 공유)
+    # 천체 조회(세그먼트 체인 구성)도 여기서 1회 → 작업마다 eph["earth"] 재조회 없음
+    global _EARTH, _SUN, _TS
+    eph = load(kernel_path)
+    _EARTH = eph["earth"]
+    _SUN = eph["sun"]
+    _TS = load.timescale()
 
-            if best is None or kst_dt < best[0]:
-                best = (kst_dt, utc_dt)
 
-        if best is None:
-            raise RuntimeError(f"{year} {name} not found")
+def _year_chunk(years):
+    return generate_years(_EARTH, _SUN, _TS, years)
 
-        kst_dt, utc_dt = best
-        results.append(
-            {
-                "name": name,
-                "degree": int(deg),
-                "utc": utc_dt.isoformat().replace("+00:00", "Z"),
-                "kst": kst_dt.isoformat(),
-            }
-        )
 
-    results.sort(key=lambda x: x["utc"])
-    return results
+def _run_chunks(chunks, workers: int, kernel_path: str):
+    # 워커 1개면 풀 없이 현재 프로세스에서 (프로세스 기동 + 천체력 재로드 생략)
+    if workers == 1:
+        _init_worker(kernel_path)
+        for chunk in chunks:
+            yield _year_chunk(chunk)
+        return
+
+    # 끝나는 순서대로 받아서 바로 저장 (연도 순서는 저장 시 정렬)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(kernel_path,)) as ex:
+        futures = [ex.submit(_year_chunk, chunk) for chunk in chunks]
+        for fut in as_completed(futures):
+            yield fut.result()
 
 
 # -----------------------------
@@ -201,26 +406,46 @@ def generate_year(eph, ts, year: int):
 # -----------------------------
 def generate():
     print(f"[JIEQI] output={OUTPUT_PATH} append={APPEND}", flush=True)
-    print(f"[JIEQI] years: {START_YEAR}..{END_YEAR}", flush=True)
-
-    eph = load("de421.bsp")
-    ts = load.timescale()
+    print(f"[JIEQI] years: {START_YEAR}..{END_YEAR} workers={WORKERS}", flush=True)
 
     data = _load_existing(OUTPUT_PATH)
 
-    for year in range(START_YEAR, END_YEAR + 1):
-        print(f"[JIEQI] year {year}", flush=True)
-        print(f"[DEBUG] calling generate_year({year})", flush=True)
+    years = np.arange(START_YEAR, END_YEAR + 1)
+    if _cache_valid(OUTPUT_PATH):
+        years = np.array([y for y in years if str(y) not in data], dtype=int)
+        print(f"[JIEQI] cache hit: {len(years)} missing years to compute", flush=True)
+
+    if len(years) == 0:
+        print("[OK] jieqi generation complete (cached)", flush=True)
+        return
+
+    # 연속 구간별로 분할 → 조각마다 스캔 1회
+    # 워커 1개면 구간 통째로 (전체 구간 단일 스캔), 병렬이면 CHUNK_YEARS 단위 작업으로
+    workers = max(1, min(WORKERS, len(years)))
+    runs = np.split(years, np.flatnonzero(np.diff(years) > 1) + 1)
+    if workers == 1:
+        chunks = [run.tolist() for run in runs]
+    else:
+        size = max(1, CHUNK_YEARS)
+        chunks = [run[i:i + size].tolist() for run in runs for i in range(0, len(run), size)]
+
+    kernel_path = _ensure_sun_kernel()
+
+    for chunk_data in _run_chunks(chunks, workers, kernel_path):
+        for year, year_data in chunk_data.items():
+            print(f"[JIEQI] year {year}", flush=True)
 
-        year_data = generate_year(eph, ts, year)
+            if not isinstance(year_data, list) or len(year_data) != 24:
+                raise RuntimeError(f"{year} returned {len(year_data) if isinstance(year_data, list) else 'non-list'} items")
 
-        if not isinstance(year_data, list) or len(year_data) != 24:
-            raise RuntimeError(f"{year} returned {len(year_data) if isinstance(year_data, list) else 'non-list'} items")
+            data[str(year)] = year_data
 
-        data[str(year)] = year_data
-        _save_json_atomic(OUTPUT_PATH, data)
+        data = dict(sorted(data.items()))
+        _save_json_atomic(OUTPUT_PATH, data, compact=True)
+        print(f"[DEBUG] years {min(chunk_data)}..{max(chunk_data)} saved", flush=True)
 
-        print(f"[DEBUG] generate_year({year}) returned 24 items", flush=True)
+    _save_json_atomic(OUTPUT_PATH, data, compact=COMPACT)
+    _save_stamp()
 
     print("[OK] jieqi generation complete", flush=True)
 